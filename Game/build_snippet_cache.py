@@ -0,0 +1,88 @@
+# Standard modules
+import argparse
+import sys
+from typing import List
+
+# External modules
+import numpy as np
+
+# Internal modules
+from constants import SNIPPET_CACHE
+from utils import find_snippet_files, get_snippet_event, load_snippet_file
+
+
+def main(args: List = sys.argv[1:]):
+    """Main entry point.
+
+    Parameters
+    ----------
+    args : List
+        unparsed command line arguments
+    """
+    parsed_args = _parse_args(args)
+
+    for snippet_folder in parsed_args.snippet_folders:
+        print(f"Building snippet cache for {snippet_folder}...")
+        count = build_snippet_cache(snippet_folder)
+        print(f"Cached {count} snippets!")
+
+
+def _parse_args(args: List) -> argparse.Namespace:
+    """Parses command line arguments.
+
+    Parameters
+    ----------
+    args : List
+        unparsed command line arguments
+
+    Returns
+    -------
+    args : argparse.Namespace
+        parsed command line arguments
+    """
+
+    parser = argparse.ArgumentParser(
+        description="This CLI program is used to pack snippet files into a single cache file per folder."
+    )
+
+    parser.add_argument(
+        "snippet_folders",
+        nargs="*",
+        default=["../WaveformSnipper/Snippets", "../WaveformSnipper/Snippets/Noise"],
+        help="The snippet folders to build caches for.",
+    )
+
+    return parser.parse_args(args)
+
+
+def build_snippet_cache(snippet_folder: str) -> int:
+    """Packs every snippet file in a folder into a single cache file in that folder. The cache must be rebuilt whenever
+    the snippet files change.
+
+    The cache stores the snippets stacked side by side in `data`, the event of each snippet in `events` and the column
+    at which each snippet starts in `offsets`, with a final offset marking the end of the last snippet.
+
+    Parameters
+    ----------
+    snippet_folder : str
+        the folder of snippets to cache.
+
+    Returns
+    -------
+    count : int
+        the number of snippets cached.
+    """
+    loaded_snippets = [
+        snippet for snippet_file in find_snippet_files(snippet_folder) for snippet in load_snippet_file(snippet_file)
+    ]
+    snippets = [snippet for _, snippet in loaded_snippets]
+    events = np.array([get_snippet_event(snippet_name) for snippet_name, _ in loaded_snippets], dtype=str)
+    offsets = np.zeros(len(snippets) + 1, dtype=np.int64)
+    np.cumsum([snippet.shape[1] for snippet in snippets], out=offsets[1:])
+    data = np.concatenate(snippets, axis=1) if snippets else np.empty((2, 0))
+    np.savez(f"{snippet_folder}/{SNIPPET_CACHE}", data=data, events=events, offsets=offsets)
+    return len(snippets)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,3 +18,6 @@ CONTROL_SHOOT = "SHOOT"
 SPIKERSTREAM = "SpikerStream"
 ARRAYSTREAM = "ArrayStream"
 WAVSTREAM = "WAVStream"
+
+# File name of the snippet cache in a snippet folder
+SNIPPET_CACHE = "snippets_cache.npz"
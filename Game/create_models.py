@@ -1,25 +1,27 @@
 # Standard modules
 import argparse
-import glob
+from concurrent.futures import ThreadPoolExecutor
+import os
 import sys
 import time
 from typing import Dict, List, Tuple
 
 # External modules
-from catch22 import catch22_all
-from joblib import dump
+from joblib import Parallel, cpu_count, delayed, dump
 import numpy as np
-# Models
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.ensemble import RandomForestClassifier
-from sklearn import svm
 
 # Internal modules
-from utils import get_snippet_event, parse_snippet
+from constants import SNIPPET_CACHE
+from utils import catch22_features, find_snippet_files, get_snippet_event, load_snippet_file, parse_snippet
 
 # Type aliases
 Snippets = Dict[str, List[Tuple[np.ndarray, np.ndarray]]]
 
+# Number of snippet files each loading thread reads at a time
+SNIPPET_BATCH_SIZE = 8
+# Number of blocks of snippets given to each core when computing catch22 features
+BLOCKS_PER_CORE = 4
+
 
 def main(args: List = sys.argv[1:]):
     """Main entry point.
@@ -31,19 +33,21 @@ def main(args: List = sys.argv[1:]):
     """
     parsed_args = _parse_args(args)
 
-    # Select model to train
+    # Select model to train, only importing the models that are used
     models = []
-    if parsed_args.model_type == "KNN":
-        models.append(KNeighborsClassifier(n_neighbors=5))
-    elif parsed_args.model_type == "RFC":
-        models.append(RandomForestClassifier())
-    elif parsed_args.model_type == "SVM":
-        models.append(svm.SVC())
-    elif parsed_args.model_type == "all":
-        models.append(KNeighborsClassifier(n_neighbors=5))
-        models.append(RandomForestClassifier())
-        models.append(svm.SVC())
-    else:
+    if parsed_args.model_type == "KNN" or parsed_args.model_type == "all":
+        from sklearn.neighbors import KNeighborsClassifier
+        models.append(KNeighborsClassifier(n_neighbors=5, algorithm="ball_tree", n_jobs=-1))
+    if parsed_args.model_type == "RFC" or parsed_args.model_type == "all":
+        from sklearn.ensemble import RandomForestClassifier
+        models.append(RandomForestClassifier(n_estimators=100, max_features="sqrt", n_jobs=-1))
+    if parsed_args.model_type == "SVM" or parsed_args.model_type == "all":
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.svm import LinearSVC
+        # Linear kernel on standardised features, which converges far faster than an RBF kernel
+        models.append(make_pipeline(StandardScaler(), LinearSVC(dual="auto", max_iter=2000)))
+    if not models:
         print(f"The model type {parsed_args.model_type} is invalid! Please choose a valid model type.")
         sys.exit()
 
@@ -113,6 +117,9 @@ def load_snippets(
 ) -> Snippets:
     """Load snippets from a folder into a dictionary of event types and slices.
 
+    Snippets are read from the folder's snippet cache if it has been built with build_snippet_cache.py, otherwise each
+    snippet file is loaded individually.
+
     Parameters
     ----------
     snippets : Snippets
@@ -125,15 +132,30 @@ def load_snippets(
     snippets : Snippets
         the loaded snippets.
     """
-    # Find all snippets
-    for snippet_file in glob.glob(f"{snippet_folder}/*.npy"):
-        # Load data
-        snippet = np.load(snippet_file)
-        signal_slice, time_slice = parse_snippet(snippet)
-        event = get_snippet_event(snippet_file)
+    cache_file = f"{snippet_folder}/{SNIPPET_CACHE}"
+    if os.path.isfile(cache_file):
+        loaded_snippets = _load_snippet_cache(cache_file)
+    else:
+        # Find all snippets
+        snippet_files = find_snippet_files(snippet_folder)
+        # Group adjacent files into batches so each thread reads a block of files before handing off
+        batches = [
+            snippet_files[i:i + SNIPPET_BATCH_SIZE] for i in range(0, len(snippet_files), SNIPPET_BATCH_SIZE)
+        ]
+        # Load data concurrently
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            loaded_batches = list(executor.map(_load_snippet_batch, batches))
+        loaded_snippets = [
+            (get_snippet_event(snippet_name), snippet)
+            for loaded_batch in loaded_batches
+            for snippet_name, snippet in loaded_batch
+        ]
+
+    for event, snippet in loaded_snippets:
         # Looking only at left, right and noise
         if event != "left" and event != "right" and event != "noise":
             continue
+        signal_slice, time_slice = parse_snippet(snippet)
         # Add data to dictionary
         if event not in snippets:
             snippets[event] = [(signal_slice, time_slice)]
@@ -143,8 +165,47 @@ def load_snippets(
     return snippets
 
 
-def process_snippets(snippets: Snippets) -> Tuple[List, List]:
-    """Process snippet data into a list of catch22 features.
+def _load_snippet_cache(cache_file: str) -> List[Tuple[str, np.ndarray]]:
+    """Loads every snippet from a snippet cache created by build_snippet_cache.py.
+
+    Parameters
+    ----------
+    cache_file : str
+        the path of the snippet cache.
+
+    Returns
+    -------
+    loaded_snippets : List[Tuple[str, np.ndarray]]
+        the event and array of each snippet. The arrays are views into the cache's stacked snippets.
+    """
+    with np.load(cache_file, allow_pickle=False) as cache:
+        data = cache["data"]
+        events = cache["events"].tolist()
+        offsets = cache["offsets"]
+    return [(event, data[:, offsets[i]:offsets[i + 1]]) for i, event in enumerate(events)]
+
+
+def _load_snippet_batch(snippet_files: List[str]) -> List[Tuple[str, np.ndarray]]:
+    """Loads a batch of snippet files.
+
+    Parameters
+    ----------
+    snippet_files : List[str]
+        the paths of the snippet files to load.
+
+    Returns
+    -------
+    loaded_batch : List[Tuple[str, np.ndarray]]
+        the name and array of each snippet in the files.
+    """
+    return [snippet for snippet_file in snippet_files for snippet in load_snippet_file(snippet_file)]
+
+
+def process_snippets(snippets: Snippets) -> Tuple[np.ndarray, np.ndarray]:
+    """Process snippet data into an array of catch22 features.
+
+    Feature extraction is spread across all available cores, each worker computing the features of a contiguous block of
+    snippets.
 
     Parameters
     ----------
@@ -153,23 +214,51 @@ def process_snippets(snippets: Snippets) -> Tuple[List, List]:
 
     Returns
     -------
-    data : List[List]
-        list of catch22 features for each snippet.
-    labels : List[str]
-        corresponding list of labels for each snippet.
+    data : np.ndarray
+        array of catch22 features for each snippet with shape (n, 22).
+    labels : np.ndarray
+        corresponding array of labels for each snippet.
     """
-    # Compute catch22 data
-    data = []
-    # Create list of labels and names associated with catch22 data
-    labels = []
+    # Allocate the catch22 data and labels once. Single precision is plenty for the models and halves the memory
+    # moved by every distance computation.
+    n = sum(len(event_snippets) for event_snippets in snippets.values())
+    data = np.empty((n, 22), dtype=np.float32)
+    labels = np.empty(n, dtype=object)
+    signals = []
     for event in snippets:
-        for signal_slice, _ in snippets[event]:
-            data.append(catch22_all(signal_slice)["values"])
-            labels.append(event)
+        labels[len(signals):len(signals) + len(snippets[event])] = event
+        signals += [signal_slice for signal_slice, _ in snippets[event]]
+    # Split the snippets into a few blocks per core so workers stay busy when snippet lengths vary
+    bounds = np.linspace(0, n, min(n, BLOCKS_PER_CORE * cpu_count()) + 1).astype(int)
+    # Compute catch22 data in parallel
+    blocks = Parallel(n_jobs=-1, backend="loky")(
+        delayed(_catch22_block)(signals[start:end]) for start, end in zip(bounds[:-1], bounds[1:])
+    )
+    for start, block in zip(bounds[:-1], blocks):
+        data[start:start + len(block)] = block
     print(f"There are {len(data)} samples to train/test on.")
 
     return data, labels
 
 
+def _catch22_block(signals: List[np.ndarray]) -> np.ndarray:
+    """Computes the catch22 features of a block of signals.
+
+    Parameters
+    ----------
+    signals : List[np.ndarray]
+        the signals to compute the features of.
+
+    Returns
+    -------
+    features : np.ndarray
+        array of catch22 features for each signal with shape (len(signals), 22).
+    """
+    features = np.empty((len(signals), 22), dtype=np.float32)
+    for i, signal in enumerate(signals):
+        features[i] = catch22_features(signal)
+    return features
+
+
 if __name__ == "__main__":
     main()
@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 # Standard modules
-import random
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 # External modules
+import numpy as np
 import pygame
 from pygame.math import Vector2
 
@@ -32,6 +32,14 @@ class Entity:
         (60, 4),
     ]
 
+    # Sprite paths
+    PLAYER_SPRITE: str = "assets/player.png"
+    ENEMY_SPRITE: str = "assets/enemy.png"
+    PROJECTILE_SPRITE: str = "assets/projectile.png"
+
+    # Decoded sprites and their collision boxes shared between entities, keyed by sprite path
+    _sprite_cache: Dict[str, Tuple[pygame.Surface, Tuple[int, int]]] = {}
+
     def __init__(self, position: Vector2, sprite_path: str, hp: int):
         """Main constructor for entities. Specialised constructors are probably more useful.
 
@@ -44,48 +52,40 @@ class Entity:
         hp : int
             the initial HP of the entity.
         """
-        # Load sprite
-        self._sprite = pygame.image.load(sprite_path)
-        # Collision box used in collision detection. Based off the entity's sprite.
-        self._collision_box = self._sprite.get_rect()[2::]
-        # Current position
-        self._position = position
+        # Load sprite and the width and height of the collision box used in collision detection. Based off the entity's
+        # sprite.
+        self._sprite, (self.width, self.height) = Entity.load_sprite(sprite_path)
+        # Current position. Plain attributes rather than properties as they are accessed every frame.
+        self.x, self.y = position
         # Entity health
         self._hp = hp
 
-    # Access methods
-    @property
-    def position(self):
-        """pygame.math.Vector2: the position vector of the entity."""
-        return self._position
-
-    @property
-    def x(self):
-        """int: the x coordinate of the entity's position."""
-        return self._position[0]
-
-    @x.setter
-    def x(self, new_value: int):
-        self._position[0] = new_value
-
-    @property
-    def y(self):
-        """int: the y coordinate of the entity's position."""
-        return self._position[1]
+    @staticmethod
+    def load_sprite(sprite_path: str) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """Loads a sprite, decoding it from disk only the first time it is used.
 
-    @y.setter
-    def y(self, new_value: int):
-        self._position[1] = new_value
+        Parameters
+        ----------
+        sprite_path : str
+            the path to the sprite. Must be valid.
 
-    @property
-    def width(self):
-        """int: the width of the entity's sprite."""
-        return self._collision_box[0]
+        Returns
+        -------
+        sprite : pygame.Surface
+            the sprite shared by all entities using `sprite_path`.
+        collision_box : Tuple[int, int]
+            the width and height of the sprite.
+        """
+        if sprite_path not in Entity._sprite_cache:
+            sprite = pygame.image.load(sprite_path).convert_alpha()
+            Entity._sprite_cache[sprite_path] = (sprite, sprite.get_rect().size)
+        return Entity._sprite_cache[sprite_path]
 
+    # Access methods
     @property
-    def height(self):
-        """int: the height of the entity's sprite."""
-        return self._collision_box[1]
+    def position(self):
+        """pygame.math.Vector2: the position vector of the entity."""
+        return Vector2(self.x, self.y)
 
     @property
     def hp(self):
@@ -98,24 +98,8 @@ class Entity:
 
     @property
     def sprite_position(self):
-        """Tuple[pygame.Surface, Vector2]: the sprite and current position of the entity."""
-        return (self._sprite, self._position)
-
-    def detect_collision(self, other: Entity):
-        """Detects collision between entities, returing `True` if a collision has occurred, otherwise `False`, assuming all
-        collision boxes are rectangles.
-
-        Parameters
-        ----------
-        other : Entity
-            other entity involved the potential collision.
-
-        Returns
-        -------
-        result : bool
-            `True` if collision has occurred else `False`.
-        """
-        return self.x > other.x and self.x < (other.x + other.width) and self.y > other.y and self.y < (other.y + other.height)
+        """Tuple[pygame.Surface, Tuple[float, float]]: the sprite and current position of the entity."""
+        return (self._sprite, (self.x, self.y))
 
     # Constructors
     @classmethod
@@ -127,48 +111,42 @@ class Entity:
         player: Entity
             the player entity.
         """
-        return Entity(Vector2(cls.spawn_position[cls.PLAYER_SPAWN]), "assets/player.png", cls.PLAYER_HP)
-
-    @classmethod
-    def spawn_enemy(cls, lane_index: int):
-        """Constructs an entity corresponding to an enemy.
-
-        Parameters
-        ----------
-        lane_index: int
-            the index of the lane the enemy should spawn in going from 1 -> 3.
-
-        Returns
-        -------
-        enemy: Entity
-            the enemy entity spawned at the starting position of the given lane.
-        """
-        return Entity(Vector2(cls.spawn_position[lane_index]), "assets/enemy.png", cls.ENEMY_HP)
-
-    @classmethod
-    def spawn_enemy_random(cls):
-        """Constructs an entity corresponding to an enemy in a random lane.
-
-        Returns
-        -------
-        enemy: Entity
-            the enemy entity spawned at the starting position of a random lane.
-        """
-        lane_index = random.randint(1, 3)
-        return Entity(Vector2(cls.spawn_position[lane_index]), "assets/enemy.png", cls.ENEMY_HP)
-
-    @classmethod
-    def spawn_projectile(cls, position: Vector2):
-        """Constructs an entity corresponding to a player projectile.
-
-        Parameters
-        ----------
-        position: Vector2
-            the spawn position of the projectile.
-
-        Returns
-        -------
-        projectile: Entity
-            the projectile entity.
-        """
-        return Entity(position, "assets/projectile.png", cls.PROJECTILE_HP)
+        return Entity(Vector2(cls.spawn_position[cls.PLAYER_SPAWN]), cls.PLAYER_SPRITE, cls.PLAYER_HP)
+
+
+def detect_collisions(
+    x: np.ndarray,
+    y: np.ndarray,
+    box_x: np.ndarray,
+    box_y: np.ndarray,
+    box_width: int,
+    box_height: int,
+) -> np.ndarray:
+    """Detects collisions between every point and every box at once, assuming all collision boxes are rectangles of the
+    same size. A point collides with a box when it lies strictly inside it, with coordinates truncated to whole pixels
+    as they are when drawn.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        the x coordinates of the colliding entities with shape (P,).
+    y : np.ndarray
+        the y coordinates of the colliding entities with shape (P,).
+    box_x : np.ndarray
+        the x coordinates of the entities that are collided with, with shape (B,).
+    box_y : np.ndarray
+        the y coordinates of the entities that are collided with, with shape (B,).
+    box_width : int
+        the width of the collision boxes.
+    box_height : int
+        the height of the collision boxes.
+
+    Returns
+    -------
+    collisions : np.ndarray
+        boolean matrix with shape (P, B) that is `True` where a point lies inside a box.
+    """
+    dx = x.astype(np.int32)[:, np.newaxis] - box_x.astype(np.int32)[np.newaxis, :]
+    dy = y.astype(np.int32)[:, np.newaxis] - box_y.astype(np.int32)[np.newaxis, :]
+    # 0 < d < size as a single unsigned comparison, d - 1 wraps around to a large value when d <= 0
+    return ((dx - 1).view(np.uint32) < np.uint32(box_width - 1)) & ((dy - 1).view(np.uint32) < np.uint32(box_height - 1))
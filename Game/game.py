@@ -1,15 +1,20 @@
 # Standard modules
+import queue
+import random
 import sys
-from typing import List, Tuple, Dict
+import threading
+import time
+from typing import List, Optional, Tuple, Dict
 
 # External modules
+import numpy as np
 import pygame
 from pygame.math import Vector2
 from serial.serialutil import SerialException
 
 # Internal modules
 from constants import *
-from entity import Entity
+from entity import Entity, detect_collisions
 from spikerbox import SpikerBox
 
 
@@ -33,6 +38,20 @@ class Game:
     # Vertical speed of the projectiles
     PROJECTILE_SPEED: float = 6e-2
 
+    # Maximum number of enemies and projectiles alive at once
+    MAX_ENEMIES: int = 64
+    MAX_PROJECTILES: int = 64
+
+    # Key down actions, an action type and its control if it has one
+    _KEY_TABLE: Dict[int, Tuple[str, Optional[str]]] = {
+        pygame.K_LEFT: ("control", CONTROL_LEFT),
+        pygame.K_RIGHT: ("control", CONTROL_RIGHT),
+        pygame.K_SPACE: ("control", CONTROL_SHOOT),
+        pygame.K_ESCAPE: ("quit", None),
+        pygame.K_F11: ("fullscreen", None),
+        pygame.K_F10: ("toggle_input", None),
+    }
+
     def __init__(
         self,
         keyboard: bool = True,
@@ -55,10 +74,21 @@ class Game:
             CONTROL_RIGHT: 0,
             CONTROL_SHOOT: 0,
         }
-        self._player: Entity = Entity.spawn_player()
-        self._enemies: List[Entity] = []
-        self._projectiles: List[Entity] = []
+        # The renderer must be created first as sprites are converted to the display's pixel format
         self._renderer: Renderer = Renderer(Game.WIDTH, Game.HEIGHT)
+        self._player: Entity = Entity.spawn_player()
+        # Enemies and projectiles are stored as fixed size parallel arrays of positions and health, with a mask of the
+        # slots that are in use
+        self._enemy_sprite, (self._enemy_width, self._enemy_height) = Entity.load_sprite(Entity.ENEMY_SPRITE)
+        self._enemy_x: np.ndarray = np.zeros(Game.MAX_ENEMIES, dtype=np.float64)
+        self._enemy_y: np.ndarray = np.zeros(Game.MAX_ENEMIES, dtype=np.float64)
+        self._enemy_hp: np.ndarray = np.zeros(Game.MAX_ENEMIES, dtype=np.int64)
+        self._enemy_alive: np.ndarray = np.zeros(Game.MAX_ENEMIES, dtype=bool)
+        self._projectile_sprite, _ = Entity.load_sprite(Entity.PROJECTILE_SPRITE)
+        self._projectile_x: np.ndarray = np.zeros(Game.MAX_PROJECTILES, dtype=np.float64)
+        self._projectile_y: np.ndarray = np.zeros(Game.MAX_PROJECTILES, dtype=np.float64)
+        self._projectile_hp: np.ndarray = np.zeros(Game.MAX_PROJECTILES, dtype=np.int64)
+        self._projectile_alive: np.ndarray = np.zeros(Game.MAX_PROJECTILES, dtype=bool)
         self._spawn_timer: int = pygame.time.get_ticks()
         self.keyboard = keyboard
         self._tick = 0
@@ -67,6 +97,13 @@ class Game:
         except SerialException as _:
             print("Invalid serial port. Can only use keyboard controls.")
             self.spikerbox = None
+        # SpikerBox input is classified on a background thread so it doesn't block rendering. Only the latest controls
+        # are kept.
+        self._spikerbox_controls: queue.Queue = queue.Queue(maxsize=1)
+        # Error that stopped the background thread, raised on the main thread by process_input
+        self._spikerbox_error: Optional[Exception] = None
+        if self.spikerbox is not None:
+            threading.Thread(target=self._spikerbox_worker, daemon=True).start()
 
     def update(self):
         """Updates the game by one frame."""
@@ -98,79 +135,111 @@ class Game:
         # Player
         all_entities = [self._player.sprite_position]
         # Enemies
-        all_entities += [enemy.sprite_position for enemy in self._enemies]
+        all_entities += [
+            (self._enemy_sprite, (self._enemy_x[i], self._enemy_y[i])) for i in np.flatnonzero(self._enemy_alive)
+        ]
         # Projectiles
-        all_entities += [projectile.sprite_position for projectile in self._projectiles]
+        all_entities += [
+            (self._projectile_sprite, (self._projectile_x[i], self._projectile_y[i]))
+            for i in np.flatnonzero(self._projectile_alive)
+        ]
         return all_entities
 
     def spawn_enemy(self):
         """Spawns an enemy in a random lane given enough time has passed."""
         if (pygame.time.get_ticks() - self._spawn_timer) / 1000 > Game.ENEMY_SPAWN_TIME:
-            self._enemies.append(Entity.spawn_enemy_random())
+            # Use the first free slot, skipping the spawn if there are none
+            i = np.argmin(self._enemy_alive)
+            if not self._enemy_alive[i]:
+                lane_index = random.randint(Entity.ENEMY_LEFT_SPAWN, Entity.ENEMY_RIGHT_SPAWN)
+                self._enemy_x[i], self._enemy_y[i] = Entity.spawn_position[lane_index]
+                self._enemy_hp[i] = Entity.ENEMY_HP
+                self._enemy_alive[i] = True
             self._spawn_timer = pygame.time.get_ticks()
 
     def process_input(self, keyboard: bool = True):
-        """Processes game input."""
-        if keyboard or self.spikerbox is None:
-            self.process_input_keyboard()
-        else:
-            self.process_input_spikerbox()
-
-    def process_input_keyboard(self):
-        """Processes keyboard input."""
-        for event in pygame.event.get():
-            # Quit
-            if event.type == pygame.QUIT:
-                sys.exit()
-            # Key down events
-            if event.type == pygame.KEYDOWN:
-                # Escape
-                if event.key == pygame.K_ESCAPE:
-                    sys.exit()
-                # Left and right controls
-                if event.key == pygame.K_LEFT:
-                    self._controls[CONTROL_LEFT] = 1
-                if event.key == pygame.K_RIGHT:
-                    self._controls[CONTROL_RIGHT] = 1
-                # Shooting controls
-                if event.key == pygame.K_SPACE:
-                    self._controls[CONTROL_SHOOT] = 1
-                # Fullscreen
-                if event.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-                # Switch to SpikerBox input
-                if event.key == pygame.K_F10:
-                    self.keyboard = False
-
-    def process_input_spikerbox(self):
-        """Processes SpikerBox input."""
+        """Processes game input.
+
+        Parameters
+        ----------
+        keyboard : bool
+            if true will use keyboard controls else will use SpikerBox controls.
+        """
+        keyboard = keyboard or self.spikerbox is None
         for event in pygame.event.get():
             # Quit
             if event.type == pygame.QUIT:
                 sys.exit()
             # Key down events
             if event.type == pygame.KEYDOWN:
-                # Escape
-                if event.key == pygame.K_ESCAPE:
-                    sys.exit()
-                # Fullscreen
-                if event.key == pygame.K_F11:
-                    pygame.display.toggle_fullscreen()
-                # Switch to keyboard input
-                if event.key == pygame.K_F10:
-                    self.keyboard = True
-        # SpikerBox processing
-        self._controls = self.spikerbox.process_input(self._controls, self._tick)
+                action = Game._KEY_TABLE.get(event.key)
+                if action is not None:
+                    self._dispatch(action, keyboard)
+        # Latest SpikerBox controls
+        if not keyboard:
+            if self._spikerbox_error is not None:
+                raise self._spikerbox_error
+            try:
+                self._controls.update(self._spikerbox_controls.get_nowait())
+            except queue.Empty:
+                pass
+
+    def _spikerbox_worker(self):
+        """Continuously processes SpikerBox input, publishing the controls of each classification. Stops on the first
+        error, storing it to be raised on the main thread.
+        """
+        buffer_time = self.spikerbox.stream.buffer_time
+        try:
+            while True:
+                # Wait for the stream to fill so there is no overlap between reads
+                time.sleep(buffer_time)
+                if self.keyboard:
+                    continue
+                controls = self.spikerbox.process_input(dict.fromkeys(self._controls, 0), buffer_time * 1000)
+                # Replace the previous controls if the game hasn't used them yet
+                try:
+                    self._spikerbox_controls.get_nowait()
+                except queue.Empty:
+                    pass
+                self._spikerbox_controls.put_nowait(controls)
+        except Exception as e:
+            self._spikerbox_error = e
+
+    def _dispatch(self, action: Tuple[str, Optional[str]], keyboard: bool):
+        """Performs a key down action.
+
+        Parameters
+        ----------
+        action : Tuple[str, Optional[str]]
+            the action type and its control if it has one.
+        keyboard : bool
+            if true keyboard controls are in use else SpikerBox controls are in use.
+        """
+        action_type, control = action
+        # Left, right and shooting controls are only taken from the keyboard when using keyboard input
+        if action_type == "control":
+            if keyboard:
+                self._controls[control] = 1
+        # Escape
+        elif action_type == "quit":
+            sys.exit()
+        # Fullscreen
+        elif action_type == "fullscreen":
+            pygame.display.toggle_fullscreen()
+        # Switch between keyboard and SpikerBox input
+        elif action_type == "toggle_input":
+            self.keyboard = not keyboard
 
     def shoot_projectile(self):
         """Shoot player projectiles."""
         # Shoot a player projectile
         if self._controls[CONTROL_SHOOT] == 1:
-            self._projectiles.append(
-                Entity.spawn_projectile(
-                    self._player.position + Game.PROJECTILE_OFFSET
-                    )
-                )
+            # Use the first free slot, skipping the shot if there are none
+            i = np.argmin(self._projectile_alive)
+            if not self._projectile_alive[i]:
+                self._projectile_x[i], self._projectile_y[i] = self._player.position + Game.PROJECTILE_OFFSET
+                self._projectile_hp[i] = Entity.PROJECTILE_HP
+                self._projectile_alive[i] = True
             self._controls[CONTROL_SHOOT] = 0
 
     def move_entities(self, delta_time: int):
@@ -191,34 +260,50 @@ class Game:
                 self._player.x += Game.PLAYER_LANE_OFFSET
             self._controls[CONTROL_RIGHT] = 0
 
-        # Move enemies down
-        for enemy in self._enemies:
-            enemy.y += Game.ENEMY_SPEED * delta_time
+        # Move enemies down. Free slots are moved too as it is cheaper than masking.
+        self._enemy_y += Game.ENEMY_SPEED * delta_time
         # Deleting them if they go out of screen
-        self._enemies[:] = [enemy for enemy in self._enemies if enemy.y <= Game.HEIGHT]
+        self._enemy_alive &= self._enemy_y <= Game.HEIGHT
 
         # Move projectiles up
-        for projectile in self._projectiles:
-            projectile.y -= Game.PROJECTILE_SPEED * delta_time
+        self._projectile_y -= Game.PROJECTILE_SPEED * delta_time
         # Deleting them if they go out of screen
-        self._projectiles[:] = [projectile for projectile in self._projectiles if projectile.y >= 0]
+        self._projectile_alive &= self._projectile_y >= 0
 
     def handle_collision(self):
         """Detects and handles collision between entities."""
-        for enemy in self._enemies:
-            for projectile in self._projectiles:
-                if projectile.hp > 0 and projectile.detect_collision(enemy):
-                    enemy.hp -= 1
-                    projectile.hp -= 1
-            if enemy.hp > 0 and enemy.detect_collision(self._player):
-                self._player.hp -= 1
-                enemy.hp -= 1
-                if self._player.hp <= 0:
-                    self.game_over()
-
-        # Filter out dead enemies and projectiles
-        self._enemies[:] = [enemy for enemy in self._enemies if enemy.hp > 0]
-        self._projectiles[:] = [projectile for projectile in self._projectiles if projectile.hp > 0]
+        # Projectiles (rows) colliding with enemies (columns)
+        hits = detect_collisions(
+            self._projectile_x,
+            self._projectile_y,
+            self._enemy_x,
+            self._enemy_y,
+            self._enemy_width,
+            self._enemy_height,
+        )
+        hits &= self._projectile_alive[:, np.newaxis] & self._enemy_alive[np.newaxis, :]
+        enemies_hit = np.any(hits, axis=0)
+        self._enemy_hp -= enemies_hit
+        self._projectile_hp -= np.any(hits, axis=1)
+
+        # Enemies that survived colliding with the player
+        player_hits = detect_collisions(
+            self._enemy_x,
+            self._enemy_y,
+            np.array([self._player.x]),
+            np.array([self._player.y]),
+            self._player.width,
+            self._player.height,
+        )[:, 0] & self._enemy_alive & ~enemies_hit
+        for _ in range(np.count_nonzero(player_hits)):
+            self._player.hp -= 1
+            if self._player.hp <= 0:
+                self.game_over()
+        self._enemy_hp -= player_hits
+
+        # Free the slots of dead enemies and projectiles
+        self._enemy_alive &= self._enemy_hp > 0
+        self._projectile_alive &= self._projectile_hp > 0
 
     def game_over(self):
         """Game over."""
@@ -246,6 +331,8 @@ class Renderer:
 
         # Fonts
         self.font = pygame.font.SysFont("Arial", 14)
+        # Rendered FPS counter text, keyed by FPS
+        self._fps_text: Dict[int, pygame.Surface] = {}
 
     def draw(self, entities: List[Tuple[pygame.Surface, Vector2]]):
         """Draw the entities to the screen and handles scaling the screen to the window.
@@ -261,11 +348,16 @@ class Renderer:
         for entity in entities:
             self.screen.blit(*entity)
 
-        # Display FPS
-        display_text = self.font.render(str(int(self.clock.get_fps())), 0, pygame.Color("white"))
+        # Display FPS, only rendering the text the first time each value is shown
+        fps = int(self.clock.get_fps())
+        display_text = self._fps_text.get(fps)
+        if display_text is None:
+            display_text = self.font.render(str(fps), 0, pygame.Color("white"))
+            self._fps_text[fps] = display_text
 
-        # Draw the screen to the window properly scaled
-        self.window.blit(pygame.transform.scale(self.screen, self.window.get_rect().size), (0, 0))
+        # Draw the screen to the window. The window is created with pygame.SCALED so it has the same size as the screen
+        # and pygame handles scaling it to the display.
+        self.window.blit(self.screen, (0, 0))
         self.window.blit(display_text, (0, 0))
 
         # Update the display window
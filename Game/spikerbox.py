@@ -3,12 +3,10 @@ from joblib import load
 import time
 import sys
 import wave
+from typing import Optional
 
 
 # External modules
-from astropy import units as u
-from astropy.convolution import convolve, Box1DKernel
-from catch22 import catch22_all
 import numpy as np
 import serial
 from serial.serialutil import SerialException
@@ -16,12 +14,17 @@ from serial.tools import list_ports
 
 # Internal modules
 from constants import *
-from utils import normalise_signal
+from utils import catch22_features, normalise_signal, smooth_normalise_signal
 
 
 class SpikerBox:
     def __init__(self, buffer_time: float, model_type: str, stream_type: str, stream_file: str = "", cport: str = ""):
         self.model = load(MODELS[model_type])
+        # Models are trained on all cores but predict a single sample per tick so keep inference single threaded
+        if hasattr(self.model, "n_jobs"):
+            self.model.n_jobs = 1
+        # Only compute the catch22 features the model actually uses
+        self._feature_indices = _used_features(self.model)
         if stream_type == "SpikerStream":
             self.stream = SpikerStream(cport, chunk=10000)
         elif stream_type == "ArrayStream":
@@ -34,10 +37,44 @@ class SpikerBox:
             print(f"Invalid stream type {stream_type}! Exiting...")
             sys.exit()
         self.smoothing_flag = stream_type == "ArrayStream" or stream_type == "SpikerStream"
-        self.buffer = None
+        # Choose how the buffer is prepared for feature extraction once rather than every tick
+        self._normalise = self._smooth_normalise if self.smoothing_flag else normalise_signal
         self.buffer_size = int(buffer_time * SpikerStream.ARRAY_UNIT_SIZE)
+        # Most recent samples, stored at the end of a preallocated array so they are always contiguous and only moved back
+        # to the start once the array is full. The buffer never holds more than one stream update over the buffer size.
+        # Samples are at most 14 bits so single precision holds them exactly
+        self._buffer_array = np.empty(2 * (self.buffer_size + self.stream.chunk), dtype=np.float32)
+        self._buffer_end = 0
+        self._buffer_fill = 0
         self.buffer_timer = 0
 
+    @property
+    def buffer(self) -> np.ndarray:
+        """np.ndarray: view of the most recent samples in chronological order."""
+        return self._buffer_array[self._buffer_end - self._buffer_fill:self._buffer_end]
+
+    def fill_buffer(self, raw_data: np.ndarray) -> None:
+        """Adds newly streamed samples to the buffer.
+
+        Once the buffer holds more than `buffer_size` samples, one more sample than is added is discarded from its start,
+        so the classified window stays the one the models have always been given.
+        """
+        n = len(raw_data)
+        if self._buffer_fill > self.buffer_size:
+            self._buffer_fill = max(self._buffer_fill - (n + 1), 0)
+        if self._buffer_end + n > len(self._buffer_array):
+            # Move the samples that are kept to the start of the array, growing it if a large update no longer fits
+            keep = self._buffer_fill
+            buffer_array = self._buffer_array
+            if 2 * (keep + n) > len(buffer_array):
+                buffer_array = np.empty(2 * (keep + n), dtype=np.float32)
+            buffer_array[:keep] = self._buffer_array[self._buffer_end - keep:self._buffer_end]
+            self._buffer_array = buffer_array
+            self._buffer_end = keep
+        self._buffer_array[self._buffer_end:self._buffer_end + n] = raw_data
+        self._buffer_end += n
+        self._buffer_fill += n
+
     def process_input(self, controls, tick):
         # Wait self.stream.buffer_time seconds before reading from stream to ensure there is no overlap
         self.buffer_timer += tick
@@ -47,25 +84,11 @@ class SpikerBox:
             self.buffer_timer = 0
 
         # Fill buffer
-        raw_data = self.stream.update()
-        if self.buffer is None:
-            self.buffer = raw_data
-        else:
-            if len(self.buffer) > self.buffer_size:
-                # Reduce it
-                self.buffer = self.buffer[len(raw_data) + 1:]
-            self.buffer = np.concatenate([self.buffer, raw_data])
+        self.fill_buffer(self.stream.update())
+        buffer = self.buffer
         # If buffer is larger than buffer size, we can process the data in it
-        if len(self.buffer) > self.buffer_size:
-            # Smoothing
-            if self.smoothing_flag:
-                smooth_width = len(self.buffer) // 50
-                amplitude = convolve(self.buffer, Box1DKernel(smooth_width))
-            else:
-                amplitude = self.buffer
-            # Features takes 33 times longer than it should ~0.3 seconds
-            features = catch22_all(normalise_signal(amplitude))["values"]
-            label = self.model.predict([features])  # Prediction not too bad speed wise ~0.01 seconds
+        if len(buffer) > self.buffer_size:
+            label = self.predict(self._normalise(buffer))
         else:
             label = "noise"
         if label != "noise":
@@ -75,6 +98,41 @@ class SpikerBox:
         # controls[CONTROL_SHOOT] = 1 if label == "blink" else 0
         return controls
 
+    @staticmethod
+    def _smooth_normalise(signal: np.ndarray) -> np.ndarray:
+        """Smooths and normalises a signal with a moving average 1/50th of its length."""
+        smooth_width = len(signal) // 50
+        # A moving average of at most 1 sample leaves the signal unchanged
+        if smooth_width <= 1:
+            return normalise_signal(signal)
+        return smooth_normalise_signal(signal, smooth_width)
+
+    def predict(self, signal: np.ndarray) -> str:
+        """Predicts the label of a normalised signal."""
+        # Features takes 33 times longer than it should ~0.3 seconds
+        features = catch22_features(signal, self._feature_indices)
+        return self.model.predict(features[np.newaxis].astype(np.float32))[0]  # Prediction not too bad speed wise ~0.01 seconds
+
+
+def _used_features(model) -> Optional[np.ndarray]:
+    """Finds the indices of the features a model uses to make predictions.
+
+    Parameters
+    ----------
+    model : any
+        a trained model.
+
+    Returns
+    -------
+    feature_indices : Optional[np.ndarray]
+        the indices of the features that any tree of a random forest splits on, or `None` if the model uses all features.
+    """
+    if not hasattr(model, "estimators_"):
+        return None
+    # Leaves are marked with negative feature indices
+    split_features = [estimator.tree_.feature for estimator in model.estimators_]
+    return np.unique(np.concatenate([feature[feature >= 0] for feature in split_features]))
+
 
 class InputStream:
     """Input stream base class.
@@ -153,6 +211,8 @@ class SpikerStream(InputStream):
         # Set read timeout
         self.serial_handle.timeout = chunk/20000.0
         self.buffer_time = chunk/20000.0
+        # Receive buffer that serial reads are written straight into
+        self._receive_buffer = bytearray(self.chunk)
 
     def update(self) -> np.ndarray:
         """Reads the input stream from the arduino/SpikerBox.
@@ -181,10 +241,14 @@ class SpikerStream(InputStream):
         Returns
         -------
         data : np.ndarray
-            the raw data from the input buffer read as integers.
+            the raw data from the input buffer read as unsigned bytes. Only valid until the next read.
         """
-        data = self.serial_handle.read(self.chunk)
-        return np.array([int(data_bit) for data_bit in data])
+        # Drain everything already waiting in one read, only blocking when less than a chunk has arrived
+        read_size = max(self.chunk, self.serial_handle.in_waiting)
+        if read_size > len(self._receive_buffer):
+            self._receive_buffer = bytearray(read_size)
+        n_bytes = self.serial_handle.readinto(memoryview(self._receive_buffer)[:read_size])
+        return np.frombuffer(self._receive_buffer, dtype=np.uint8, count=n_bytes)
 
     @staticmethod
     def process_data(data: np.ndarray) -> np.ndarray:
@@ -200,18 +264,33 @@ class SpikerStream(InputStream):
         result : np.ndarray
             processed input buffer data.
         """
-        result = []
-        i = 1
-        while i < (len(data) - 1):
-            # Found beginning of frame
-            if data[i] > 127:
-                # Extract one sample from 2 bytes
-                intout = (np.bitwise_and(data[i], 127)) * 128
-                i += 1
-                intout = intout + data[i]
-                result = np.append(result, intout)
-            i += 1
-        return result
+        return _parse_frames(np.ascontiguousarray(data, dtype=np.uint8))
+
+
+def _parse_frames(buffer: np.ndarray) -> np.ndarray:
+    """Parses the 2 byte frames sent by the SpikerBox into samples.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        contiguous uint8 buffer of raw bytes.
+
+    Returns
+    -------
+    samples : np.ndarray
+        int16 sample of each complete frame in the buffer.
+    """
+    # Beginnings of frames, the first and last bytes are never the beginning of a frame
+    starts = np.flatnonzero(buffer[1:-1] > 127) + 1
+    # The byte after the beginning of a frame is always part of that frame, so in a run of consecutive bytes above 127
+    # only every second byte from the start of the run begins a frame
+    run_starts = np.maximum.accumulate(np.where(np.diff(starts, prepend=-1) != 1, starts, 0))
+    starts = starts[(starts - run_starts) % 2 == 0]
+    # Extract one sample from 2 bytes, each is at most 14 bits so the arithmetic can't overflow
+    samples = (buffer[starts] & 127).astype(np.int16)
+    samples <<= 7
+    samples += buffer[starts + 1]
+    return samples
 
 
 class ArrayStream(InputStream):
@@ -282,7 +361,7 @@ class WAVStream(InputStream):
         # Open .wav file
         w = wave.open(wav_file)
         # Extract raw audio from .wav file
-        self.array = np.array(np.frombuffer(w.readframes(-1), dtype=np.int16), dtype=np.float64).tolist()
+        self.array = np.frombuffer(w.readframes(-1), dtype=np.int16).astype(np.float32)
         super().__init__(int(buffer_time * w.getframerate()))
         w.close()
         self.pointer = 0
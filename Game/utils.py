@@ -1,20 +1,51 @@
 # Standard modules
+import glob
 import os
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple
 
 # External modules
 import numpy as np
+import catch22
 
 # Internal modules
+from constants import SNIPPET_CACHE
 
+# catch22 feature functions in the same order as the values returned by catch22_all
+CATCH22_FEATURES = (
+    catch22.DN_HistogramMode_5,
+    catch22.DN_HistogramMode_10,
+    catch22.CO_f1ecac,
+    catch22.CO_FirstMin_ac,
+    catch22.CO_HistogramAMI_even_2_5,
+    catch22.CO_trev_1_num,
+    catch22.MD_hrv_classic_pnn40,
+    catch22.SB_BinaryStats_mean_longstretch1,
+    catch22.SB_TransitionMatrix_3ac_sumdiagcov,
+    catch22.PD_PeriodicityWang_th0_01,
+    catch22.CO_Embed2_Dist_tau_d_expfit_meandiff,
+    catch22.IN_AutoMutualInfoStats_40_gaussian_fmmi,
+    catch22.FC_LocalSimple_mean1_tauresrat,
+    catch22.DN_OutlierInclude_p_001_mdrmd,
+    catch22.DN_OutlierInclude_n_001_mdrmd,
+    catch22.SP_Summaries_welch_rect_area_5_1,
+    catch22.SB_BinaryStats_diff_longstretch0,
+    catch22.SB_MotifThree_quantile_hh,
+    catch22.SC_FluctAnal_2_rsrangefit_50_1_logi_prop_r1,
+    catch22.SC_FluctAnal_2_dfa_50_1_2_logi_prop_r1,
+    catch22.SP_Summaries_welch_rect_centroid,
+    catch22.FC_LocalSimple_mean3_stderr,
+)
 
-def normalise_signal(signal: np.ndarray) -> np.ndarray:
+
+def normalise_signal(signal: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """Normalises a signal.
 
     Parameters
     ----------
     signal : np.ndarray
         the given signal to normalise.
+    out : Optional[np.ndarray]
+        array to store the normalised signal in, which may be the given signal itself. A new array is allocated if `None`.
 
     Returns
     -------
@@ -22,9 +53,85 @@ def normalise_signal(signal: np.ndarray) -> np.ndarray:
         the normalised signal.
     """
     signal_centre = np.mean(signal)
-    standardised_signal = signal - signal_centre
-    signal_amplitude = np.max(np.abs(standardised_signal))
-    return standardised_signal / signal_amplitude
+    standardised_signal = np.subtract(signal, signal_centre, out=out)
+    # Peak absolute value without allocating another array for np.abs
+    signal_amplitude = max(np.max(standardised_signal), -np.min(standardised_signal))
+    standardised_signal /= signal_amplitude
+    return standardised_signal
+
+
+def box_smooth(signal: np.ndarray, width: int) -> np.ndarray:
+    """Smooths a signal with a moving average. Gives the same result as astropy's convolve with a Box1DKernel of the same
+    width, but uses a prefix sum so the cost doesn't depend on the width.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        the given signal to smooth.
+    width : int
+        the width of the moving average.
+
+    Returns
+    -------
+    smoothed_signal : np.ndarray
+        the smoothed signal, the same length and floating point precision as the given signal.
+    """
+    half_width = width // 2
+    # Zero padded prefix sum, the leading zero lets each window sum be a single difference. Accumulated in double
+    # precision since the differences of a single precision prefix sum lose too many digits on long signals
+    csum = np.cumsum(np.concatenate((np.zeros(half_width + 1), signal, np.zeros(half_width))), dtype=np.float64)
+    # Sum of the centred window of 2 * half_width + 1 samples
+    window_sum = csum[2 * half_width + 1:] - csum[:-2 * half_width - 1]
+    if width % 2 == 0:
+        # Even width boxes cover an odd number of samples with the two outermost samples at half weight
+        window_sum = (window_sum + csum[2 * half_width:-1] - csum[1:-2 * half_width]) / 2
+    return (window_sum / width).astype(np.result_type(signal, np.float32), copy=False)
+
+
+def smooth_normalise_signal(signal: np.ndarray, width: int) -> np.ndarray:
+    """Smooths a signal with a moving average and normalises the smoothed signal in place. Gives the same result as
+    `normalise_signal(box_smooth(signal, width))` without allocating a second array for the normalised signal.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        the given signal to smooth and normalise.
+    width : int
+        the width of the moving average.
+
+    Returns
+    -------
+    normalised_signal : np.ndarray
+        the smoothed and normalised signal, the same length as the given signal.
+    """
+    # The smoothed signal is a new array so it can be normalised in place
+    smoothed_signal = box_smooth(signal, width)
+    return normalise_signal(smoothed_signal, out=smoothed_signal)
+
+
+def catch22_features(signal: np.ndarray, feature_indices: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Computes the catch22 features of a signal by calling each feature function directly.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        the signal to compute the features of.
+    feature_indices : Optional[Sequence[int]]
+        the indices of the features to compute. All features are computed if `None`.
+
+    Returns
+    -------
+    features : np.ndarray
+        the 22 catch22 feature values. Features that are not computed are zero.
+    """
+    if feature_indices is None:
+        feature_indices = range(len(CATCH22_FEATURES))
+    # Convert to a list once rather than once per feature
+    signal_list = signal.astype(np.float64).tolist()
+    features = np.zeros(len(CATCH22_FEATURES), dtype=np.float64)
+    for i in feature_indices:
+        features[i] = CATCH22_FEATURES[i](signal_list)
+    return features
 
 
 def parse_snippet(snippet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
@@ -47,6 +154,88 @@ def parse_snippet(snippet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     return signal_slice, time_slice
 
 
+def find_snippet_files(snippet_folder: str) -> List[str]:
+    """Finds the snippet files in a folder, taking a snippet's raw .bin file over its .npy file if it has both.
+    Aggregated .npz files saved with WaveformSnipper's -aggregate flag are included, but not the folder's snippet cache.
+
+    Parameters
+    ----------
+    snippet_folder : str
+        the folder of snippets to search.
+
+    Returns
+    -------
+    snippet_files : List[str]
+        the sorted paths of the snippet files.
+    """
+    bin_files = glob.glob(f"{snippet_folder}/*.bin")
+    bin_roots = {os.path.splitext(bin_file)[0] for bin_file in bin_files}
+    npy_files = [npy_file for npy_file in glob.glob(f"{snippet_folder}/*.npy") if npy_file[:-4] not in bin_roots]
+    npz_files = [
+        npz_file for npz_file in glob.glob(f"{snippet_folder}/*.npz") if os.path.basename(npz_file) != SNIPPET_CACHE
+    ]
+    return sorted(bin_files + npy_files + npz_files)
+
+
+def load_snippet(snippet_file: str) -> np.ndarray:
+    """Loads a snippet file created by WaveformSnipper, either a raw float32 .bin file or a .npy file.
+
+    Parameters
+    ----------
+    snippet_file : str
+        the path to the snippet file.
+
+    Returns
+    -------
+    snippet : np.ndarray
+        the snippet with the signal in the first row and the time in the second row.
+    """
+    if snippet_file.endswith(".bin"):
+        # Signal and time are stacked so the raw data has two rows
+        return np.fromfile(snippet_file, dtype=np.float32).reshape(2, -1)
+    # Read into memory rather than memory mapping, since every loaded snippet is kept and each map holds a file open
+    return np.load(snippet_file)
+
+
+def load_snippet_file(snippet_file: str) -> List[Tuple[str, np.ndarray]]:
+    """Loads every snippet in a snippet file, splitting up aggregated .npz files.
+
+    Parameters
+    ----------
+    snippet_file : str
+        the path to a snippet file found by `find_snippet_files`.
+
+    Returns
+    -------
+    snippets : List[Tuple[str, np.ndarray]]
+        the name and array of each snippet in the file. The name works with `get_snippet_event`.
+    """
+    if snippet_file.endswith(".npz"):
+        return load_aggregated_snippets(snippet_file)
+    return [(snippet_file, load_snippet(snippet_file))]
+
+
+def load_aggregated_snippets(filename: str) -> List[Tuple[str, np.ndarray]]:
+    """Loads the snippets saved together in a .npz file by WaveformSnipper's -aggregate flag.
+
+    Parameters
+    ----------
+    filename : str
+        the path of the .npz file.
+
+    Returns
+    -------
+    snippets : List[Tuple[str, np.ndarray]]
+        the name of each snippet, in the same format as snippet file names, and its array in the same layout as a
+        snippet file.
+    """
+    with np.load(filename) as aggregated_file:
+        aggregated = aggregated_file["snippets"]
+        offsets = aggregated_file["offsets"]
+        names = aggregated_file["names"]
+    return [(name, aggregated[:, start:end]) for name, start, end in zip(names.tolist(), offsets[:-1], offsets[1:])]
+
+
 def get_snippet_event(snippet_filename: str) -> str:
     """Get the event name of the snippet located at `snippet_filename`.
 
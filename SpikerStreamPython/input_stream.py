@@ -7,20 +7,8 @@ import sys
 
 # External modules
 import numpy as np
-# Import flags
+# Import flags, set once a stream first imports its library
 failed_imports = {"audio": False, "serial": False}
-try:
-    import pyaudio
-    failed_imports["audio"] = False
-except ImportError:
-    failed_imports["audio"] = True
-try:
-    import serial
-    from serial.serialutil import SerialException
-    from serial.tools import list_ports
-    failed_imports["serial"] = False
-except ImportError:
-    failed_imports["serial"] = True
 
 
 class InputStream:
@@ -71,8 +59,8 @@ class AudioStream(InputStream):
 
     Class Attributes
     ----------------
-    FORMAT : any
-        input stream data type.
+    FORMAT : str
+        name of the pyaudio input stream data type.
     CHANNELS : int
         number of audio channels. Currently only single channel is supported.
     RATE : int
@@ -81,7 +69,7 @@ class AudioStream(InputStream):
         size of the input buffer.
     """
 
-    FORMAT = pyaudio.paInt16
+    FORMAT = "paInt16"
     CHANNELS = 1
     RATE = 44100
     CHUNK = 2 * 1024
@@ -90,6 +78,12 @@ class AudioStream(InputStream):
         """Initialises and opens the audio stream."""
         super().__init__(AudioStream.CHUNK)
 
+        # Import the audio library only when it is needed since loading PortAudio is slow
+        try:
+            import pyaudio
+            failed_imports["audio"] = False
+        except ImportError:
+            failed_imports["audio"] = True
         # Quit if imports failed
         if failed_imports["audio"]:
             print("Failed to import the audio library! AudioStreams are currently unavailable!")
@@ -98,7 +92,7 @@ class AudioStream(InputStream):
         # Initialise audio stream
         self.pyaudio_instance = pyaudio.PyAudio()
         self.stream = self.pyaudio_instance.open(
-            format=AudioStream.FORMAT,
+            format=getattr(pyaudio, AudioStream.FORMAT),
             channels=AudioStream.CHANNELS,
             rate=AudioStream.RATE,
             input=True,
@@ -149,6 +143,14 @@ class SpikerStream(InputStream):
             the size of the input buffer. Note 20 000 = 1 second of time.
         """
         super().__init__(chunk)
+        # Import the serial library only when it is needed
+        try:
+            import serial
+            from serial.serialutil import SerialException
+            from serial.tools import list_ports
+            failed_imports["serial"] = False
+        except ImportError:
+            failed_imports["serial"] = True
         # Quit if imports failed
         if failed_imports["serial"]:
             print("Failed to import the serial library! SpikerStreams are currently unavailable!")
@@ -173,6 +175,8 @@ class SpikerStream(InputStream):
         # Set read timeout
         self.serial_handle.timeout = self.chunk/20000.0
         self.array_size = (self.chunk // 2) - 1
+        # Receive buffer that serial reads are written straight into
+        self._receive_buffer = bytearray(self.chunk)
 
     def update(self) -> np.ndarray:
         """Reads the input stream from the arduino/SpikerBox.
@@ -201,10 +205,11 @@ class SpikerStream(InputStream):
         Returns
         -------
         data : np.ndarray
-            the raw data from the input buffer read as integers.
+            the raw data from the input buffer read as unsigned bytes. Only valid until the next read.
         """
-        data = self.serial_handle.read(self.chunk)
-        return np.array([int(data_bit) for data_bit in data])
+        # Always read a single chunk since the plotters draw exactly array_size samples per update
+        n_bytes = self.serial_handle.readinto(self._receive_buffer)
+        return np.frombuffer(self._receive_buffer, dtype=np.uint8, count=n_bytes)
 
     @staticmethod
     def process_data(data: np.ndarray) -> np.ndarray:
@@ -220,15 +225,30 @@ class SpikerStream(InputStream):
         result : np.ndarray
             processed input buffer data.
         """
-        result = []
-        i = 1
-        while i < (len(data) - 1):
-            # Found beginning of frame
-            if data[i] > 127:
-                # Extract one sample from 2 bytes
-                intout = (np.bitwise_and(data[i], 127)) * 128
-                i += 1
-                intout = intout + data[i]
-                result = np.append(result, intout)
-            i += 1
-        return result
+        return _parse_frames(np.ascontiguousarray(data, dtype=np.uint8))
+
+
+def _parse_frames(buffer: np.ndarray) -> np.ndarray:
+    """Parses the 2 byte frames sent by the SpikerBox into samples.
+
+    Parameters
+    ----------
+    buffer : np.ndarray
+        contiguous uint8 buffer of raw bytes.
+
+    Returns
+    -------
+    samples : np.ndarray
+        int16 sample of each complete frame in the buffer.
+    """
+    # Beginnings of frames, the first and last bytes are never the beginning of a frame
+    starts = np.flatnonzero(buffer[1:-1] > 127) + 1
+    # The byte after the beginning of a frame is always part of that frame, so in a run of consecutive bytes above 127
+    # only every second byte from the start of the run begins a frame
+    run_starts = np.maximum.accumulate(np.where(np.diff(starts, prepend=-1) != 1, starts, 0))
+    starts = starts[(starts - run_starts) % 2 == 0]
+    # Extract one sample from 2 bytes, each is at most 14 bits so the arithmetic can't overflow
+    samples = (buffer[starts] & 127).astype(np.int16)
+    samples <<= 7
+    samples += buffer[starts + 1]
+    return samples
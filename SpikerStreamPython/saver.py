@@ -27,10 +27,11 @@ def main(args: List = sys.argv):
 
     start_time = time.time()
     print("Starting recording...")
-    save_array = input_stream.update()
+    # Collect chunks and join them once at the end rather than copying the whole recording every update
+    chunks = [input_stream.update()]
     while time.time() - start_time < float(parsed_args.recording_time):
-        save_array = np.concatenate([input_stream.update(), save_array])
-    np.save(parsed_args.filename[0], save_array)
+        chunks.append(input_stream.update())
+    np.save(parsed_args.filename[0], np.concatenate(chunks))
     print("Finishing recording...")
 
 
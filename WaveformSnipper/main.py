@@ -4,19 +4,28 @@
     3. Loop through pairs
         i. Parse .txt files to get timestamps
         ii. For each timestamp cut out a snippet around it size `snippet_size`.
-        iii. Save each snippet as npy array named {original_filename}_{event_name}_{event_number}.npy
-        in target folder with the first row being the signal and the second row being its time
+        iii. Save each snippet as a raw float32 array named {original_filename}_{event_name}_{event_number}.bin
+        in target folder with the first row being the signal and the second row being its time, described by a
+        {original_filename}.json file per recording
 """
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 import glob
 import json
 import os
 import sys
-import wave
-from typing import List, Tuple
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
 
+import matplotlib
 import numpy as np
+# Plots are only saved to files so use the non-interactive backend
+matplotlib.use("Agg")
 from matplotlib import pyplot as plt
+from scipy.io import wavfile
+
+# Shortest gap between events in seconds that is saved as a noise snippet
+MIN_NOISE_TIME = 0.05
 
 
 def main(args: List = sys.argv[1:]):
@@ -31,8 +40,6 @@ def main(args: List = sys.argv[1:]):
     parsed_args = _parse_args(args)
     input_directory = parsed_args.input_directory.rstrip("/")
     output_directory = parsed_args.output_directory.rstrip("/")
-    default_snippet_size = parsed_args.snippet_size
-    default_right_proportion = parsed_args.right_proportion
 
     # Check if input directory exists
     if not os.path.isdir(input_directory):
@@ -40,43 +47,20 @@ def main(args: List = sys.argv[1:]):
         print(f"The directory {input_directory} does not exist! Exiting...")
         sys.exit()
 
-    # Check if output directory exists
-    if not os.path.isdir(output_directory):
-        # If not then check if at least its parent directories exist
-        head, _ = os.path.split(output_directory)
-        head = "./" if head == "" else head
-        if not os.path.isdir(head):
-            # Exit if parent directories don't exist
-            print(f"The parent directories of the output directory {output_directory} does not exist! Exiting...")
-            sys.exit()
-        # Otherwise make the output directory
-        try:
-            os.mkdir(output_directory)
-        except OSError as e:
-            print(f"Failed to create the output directory! {e}")
-            sys.exit()
-
-    # Check if plots folder exists if plot_flag is true
-    if not os.path.isdir(output_directory + "/Plots") and parsed_args.plot_flag:
-        try:
-            os.mkdir(output_directory + "/Plots")
-        except OSError as e:
-            print(f"Failed to create the plots folder! {e}")
-            sys.exit()
-
-    # Check if noise snippets folder exists if noise_flag is true
-    if not os.path.isdir(output_directory + "/Noise") and parsed_args.noise_flag:
-        try:
-            os.mkdir(output_directory + "/Noise")
-        except OSError as e:
-            print(f"Failed to create the noise snippets folder! {e}")
-            sys.exit()
-        if not os.path.isdir(output_directory + "/Noise" + "/Plots") and parsed_args.plot_flag:
-            try:
-                os.mkdir(output_directory + "/Noise" + "/Plots")
-            except OSError as e:
-                print(f"Failed to create the plots folder! {e}")
-                sys.exit()
+    # Make the output directory and the folders that are needed inside it
+    output_folders = [output_directory]
+    if parsed_args.plot_flag:
+        output_folders.append(f"{output_directory}/Plots")
+    if parsed_args.noise_flag:
+        output_folders.append(f"{output_directory}/Noise")
+        if parsed_args.plot_flag:
+            output_folders.append(f"{output_directory}/Noise/Plots")
+    try:
+        for output_folder in output_folders:
+            os.makedirs(output_folder, exist_ok=True)
+    except OSError as e:
+        print(f"Failed to create the output directory! {e}")
+        sys.exit()
 
     # Check if config file was passed in
     config = None
@@ -88,120 +72,35 @@ def main(args: List = sys.argv[1:]):
         with open(parsed_args.config) as json_file:
             config = json.load(json_file)
 
+    # Find the .wav files in input directory and the timestamp files in a single scan
+    with os.scandir(input_directory) as entries:
+        file_names = [entry.name for entry in entries if entry.is_file()]
+    wav_names = [file_name[:-len(".wav")] for file_name in file_names if file_name.endswith(".wav")]
+    timestamp_names = {file_name[:-len(".txt")] for file_name in file_names if file_name.endswith(".txt")}
+    # Only .wav files with timestamps can be snipped
     completed = {True: [], False: []}
-    # Go through .wav files in input directory
-    for name in glob.glob(f"{input_directory}/*.wav"):
-        # File path excluding .wav
-        root_name = name.rstrip(".wav")
-        # Tail of file path excluding .wav
-        _, tail = os.path.split(name)
-        tail = tail.rstrip(".wav")
-        # Check that the wav file has timestamps
-        if os.path.isfile(root_name + ".txt"):
-            # Parse timestamps
-            timestamps = parse_timestamps(root_name + ".txt")
-            # Open .wav file
-            w = wave.open(name)
-            # Extract raw audio from .wav file
-            signal = np.array(np.frombuffer(w.readframes(-1), dtype=np.int16), dtype=np.float64).tolist()
-            # Generate corresponding times
-            t = np.linspace(0, len(signal)/w.getframerate(), len(signal))
-            # Close the .wav file
-            w.close()
-
-            # Create snippets
-            event_count = {}
-            # Noise snippets indices
-            noise_timestamps = []
-            for timestamp_id, timestamp in timestamps:
-                # Snippet and right proportion
-                if config is not None:
-                    right_proportion = config[timestamp_id]["right_proportion"]
-                    snippet_size = config[timestamp_id]["snippet_size"]
-                else:
-                    right_proportion = default_right_proportion
-                    snippet_size = default_snippet_size
-
-                # Get the index of the minimum time
-                min_time_index = np.argmin(np.abs(t - (timestamp - (1 - right_proportion) * snippet_size)))
-                # Get the index of the maximum time
-                max_time_index = np.argmin(np.abs(t - (timestamp + right_proportion * snippet_size)))
-                # Create slices
-                signal_slice = normalise_signal(np.array(signal[min_time_index:max_time_index]))
-                time_slice = t[min_time_index:max_time_index]
-                # Increment the number of events processed for this .wav file
-                if timestamp_id not in event_count:
-                    event_count[timestamp_id] = 1
-                else:
-                    event_count[timestamp_id] += 1
-                # Save signal and time slices
-                np.save(
-                    f"{output_directory}/{tail}_{timestamp_id}_{event_count[timestamp_id]}.npy",
-                    np.vstack((signal_slice, time_slice))
-                )
-
-                # Plot signal and time if flag
-                if parsed_args.plot_flag:
-                    # Create new plot
-                    plt.figure()
-                    # Plot data
-                    plt.plot(time_slice, signal_slice)
-                    # Axes, labels and title
-                    plt.xlabel("Time (s)")
-                    plt.ylabel("Normalised amplitude")
-                    plt.ylim([-1.2, 1.2])
-                    plt.title(f"{tail} Event: {timestamp_id} #{event_count[timestamp_id]}")
-                    # Save figure
-                    plt.savefig(f"{output_directory}/Plots/{tail}_{timestamp_id}_{event_count[timestamp_id]}.png")
-                    # Close
-                    plt.close()
-                if parsed_args.noise_flag:
-                    noise_timestamps.append((min_time_index, max_time_index))
-
-            # Create noise snippets
-            timestamp_id = "noise"
-            min_time_index = 0
-            for max_time_index, next_min_index in noise_timestamps:
-                if min_time_index > max_time_index:
-                    continue
-                # Create slices
-                signal_slice = normalise_signal(np.array(signal[min_time_index:max_time_index]))
-                time_slice = t[min_time_index:max_time_index]
-                # Increment indices
-                min_time_index = next_min_index
-                # Increment the number of events processed for this .wav file
-                if timestamp_id not in event_count:
-                    event_count[timestamp_id] = 1
-                else:
-                    event_count[timestamp_id] += 1
-                # Save signal and time slices
-                np.save(
-                    f"{output_directory}/Noise/{tail}_{timestamp_id}_{event_count[timestamp_id]}.npy",
-                    np.vstack((signal_slice, time_slice))
-                )
-                # Plot signal and time if flag
-                if parsed_args.plot_flag:
-                    # Create new plot
-                    plt.figure()
-                    # Plot data
-                    plt.plot(time_slice, signal_slice)
-                    # Axes, labels and title
-                    plt.xlabel("Time (s)")
-                    plt.ylabel("Normalised amplitude")
-                    plt.ylim([-1.2, 1.2])
-                    plt.title(f"{tail} Event: {timestamp_id} #{event_count[timestamp_id]}")
-                    # Save figure
-                    plt.savefig(f"{output_directory}/Noise/Plots/{tail}_{timestamp_id}_{event_count[timestamp_id]}.png")
-                    # Close
-                    plt.close()
-
-            # Update progress
-            completed[True].append(tail)
-        # Else move on to next .wav file
-        else:
-            # Update progress
-            completed[False].append(tail)
-            continue
+    for tail in wav_names:
+        completed[tail in timestamp_names].append(tail)
+
+    # Split the processes between snipping and plotting, giving each pool at least one. Processes are only started once
+    # work is submitted, so the plotting pool starts none when not plotting
+    jobs = parsed_args.jobs or os.cpu_count() or 1
+    plot_jobs = jobs // 2 if parsed_args.plot_flag else 0
+    snip_jobs = max(jobs - plot_jobs, 1)
+    plot_jobs = max(plot_jobs, 1)
+
+    # Go through .wav files with timestamps, processing each one in a separate process. Plots are drawn by a separate
+    # pool of processes so snipping doesn't wait on matplotlib
+    with ProcessPoolExecutor(max_workers=snip_jobs) as executor, \
+            ProcessPoolExecutor(max_workers=plot_jobs, initializer=_init_plot_process) as plot_executor:
+        root_names = [f"{input_directory}/{tail}" for tail in completed[True]]
+        plot_futures = []
+        for plots in executor.map(_process_wav, root_names, repeat(parsed_args), repeat(config)):
+            # Start plotting a .wav file's snippets while the remaining .wav files are snipped
+            plot_futures.extend(plot_executor.submit(plot_snippet, *plot) for plot in plots)
+        # Raise any errors from the plotting processes
+        for plot_future in plot_futures:
+            plot_future.result()
 
     # Display results
     if parsed_args.verbose:
@@ -213,6 +112,159 @@ def main(args: List = sys.argv[1:]):
     print("Finished.")
 
 
+def _process_wav(
+        root_name: str, parsed_args: argparse.Namespace, config: Optional[Dict]
+) -> List[Tuple[str, np.ndarray, np.ndarray, str]]:
+    """Creates the snippets of a .wav file that has a timestamp file.
+
+    Parameters
+    ----------
+    root_name : str
+        the path of the .wav and timestamp files excluding the file extension.
+    parsed_args : argparse.Namespace
+        parsed command line arguments.
+    config : Optional[Dict]
+        the snippet size and right proportion of each event. The command line arguments are used for events that are not
+        in the config or if `None`.
+
+    Returns
+    -------
+    plots : List[Tuple[str, np.ndarray, np.ndarray, str]]
+        the arguments of `plot_snippet` for each snippet to plot. Empty if the plot flag isn't set.
+    """
+    output_directory = parsed_args.output_directory.rstrip("/")
+    # Flags and folders used for every snippet
+    plot_flag = parsed_args.plot_flag
+    noise_flag = parsed_args.noise_flag
+    aggregate_flag = parsed_args.aggregate_flag
+    npy_flag = parsed_args.npy_flag
+    plots_directory = f"{output_directory}/Plots"
+    noise_directory = f"{output_directory}/Noise"
+    noise_plots_directory = f"{noise_directory}/Plots"
+    # Snippet size and right proportion of each event in the config, falling back to the command line arguments
+    default_params = (parsed_args.snippet_size, parsed_args.right_proportion)
+    event_params = {} if config is None else {
+        event: (settings["snippet_size"], settings["right_proportion"]) for event, settings in config.items()
+    }
+
+    # Tail of file path
+    _, tail = os.path.split(root_name)
+    # Parse timestamps
+    timestamps = parse_timestamps(root_name + ".txt")
+    # Memory map the raw audio of the .wav file so only the samples that are snipped are read
+    framerate, signal = wavfile.read(root_name + ".wav", mmap=True)
+    # Time between samples, which are spread evenly over the length of the recording. Times are only generated for
+    # the samples that are snipped
+    time_step = len(signal) / framerate / (len(signal) - 1)
+
+    # Create snippets
+    event_count = {}
+    # Array that snippets are assembled in before saving, reused between snippets
+    snippet_buffer = None
+    # Snippets that are saved together at the end if aggregating
+    aggregated_snippets = []
+    aggregated_noise_snippets = []
+    # Length of each snippet saved to its own file, recorded in a metadata file per folder
+    snippet_lengths = {}
+    noise_snippet_lengths = {}
+    # Snippets to plot
+    plots = []
+    # Noise snippets indices
+    noise_timestamps = []
+    # Snippet and right proportion of every timestamp
+    timestamp_ids = [timestamp_id for timestamp_id, _ in timestamps]
+    timestamp_times = np.array([timestamp for _, timestamp in timestamps], dtype=np.float64)
+    snippet_sizes, right_proportions = np.array(
+        [event_params.get(timestamp_id, default_params) for timestamp_id in timestamp_ids], dtype=np.float64
+    ).reshape(-1, 2).T
+    # Get the indices of the minimum and maximum times of every snippet at once
+    min_time_indices = time_to_index(timestamp_times - (1 - right_proportions) * snippet_sizes, time_step, len(signal))
+    max_time_indices = time_to_index(timestamp_times + right_proportions * snippet_sizes, time_step, len(signal))
+    for timestamp_id, min_time_index, max_time_index in zip(
+            timestamp_ids, min_time_indices.tolist(), max_time_indices.tolist()
+    ):
+        # Create slices
+        signal_slice = normalise_signal(signal[min_time_index:max_time_index])
+        time_slice = np.arange(min_time_index, max_time_index) * time_step
+        # Increment the number of events processed for this .wav file
+        if timestamp_id not in event_count:
+            event_count[timestamp_id] = 1
+        else:
+            event_count[timestamp_id] += 1
+        # Save signal and time slices
+        snippet_name = f"{tail}_{timestamp_id}_{event_count[timestamp_id]}"
+        if aggregate_flag:
+            aggregated_snippets.append((snippet_name, signal_slice, time_slice))
+        else:
+            snippet_buffer = save_snippet(
+                f"{output_directory}/{snippet_name}", signal_slice, time_slice, snippet_buffer, npy_flag
+            )
+            snippet_lengths[snippet_name] = len(signal_slice)
+
+        # Plot signal and time if flag
+        if plot_flag:
+            plots.append((
+                f"{plots_directory}/{snippet_name}.png",
+                time_slice,
+                signal_slice,
+                f"{tail} Event: {timestamp_id} #{event_count[timestamp_id]}"
+            ))
+        if noise_flag:
+            noise_timestamps.append((min_time_index, max_time_index))
+
+    # Create noise snippets
+    timestamp_id = "noise"
+    min_noise_samples = int(MIN_NOISE_TIME * framerate)
+    min_time_index = 0
+    for max_time_index, next_min_index in noise_timestamps:
+        if min_time_index > max_time_index:
+            continue
+        # Skip gaps that are too short to be useful, which would also divide by zero when normalised if empty
+        if max_time_index - min_time_index < min_noise_samples:
+            min_time_index = next_min_index
+            continue
+        # Create slices
+        signal_slice = normalise_signal(signal[min_time_index:max_time_index])
+        time_slice = np.arange(min_time_index, max_time_index) * time_step
+        # Increment indices
+        min_time_index = next_min_index
+        # Increment the number of events processed for this .wav file
+        if timestamp_id not in event_count:
+            event_count[timestamp_id] = 1
+        else:
+            event_count[timestamp_id] += 1
+        # Save signal and time slices
+        snippet_name = f"{tail}_{timestamp_id}_{event_count[timestamp_id]}"
+        if aggregate_flag:
+            aggregated_noise_snippets.append((snippet_name, signal_slice, time_slice))
+        else:
+            snippet_buffer = save_snippet(
+                f"{noise_directory}/{snippet_name}", signal_slice, time_slice, snippet_buffer, npy_flag
+            )
+            noise_snippet_lengths[snippet_name] = len(signal_slice)
+        # Plot signal and time if flag
+        if plot_flag:
+            plots.append((
+                f"{noise_plots_directory}/{snippet_name}.png",
+                time_slice,
+                signal_slice,
+                f"{tail} Event: {timestamp_id} #{event_count[timestamp_id]}"
+            ))
+
+    # Save the snippets of the .wav file together
+    if aggregate_flag:
+        save_aggregated_snippets(f"{output_directory}/{tail}.npz", aggregated_snippets)
+        if noise_flag:
+            save_aggregated_snippets(f"{noise_directory}/{tail}.npz", aggregated_noise_snippets)
+    # Otherwise describe the snippet files of the .wav file
+    else:
+        save_snippet_metadata(f"{output_directory}/{tail}.json", framerate, snippet_lengths)
+        if noise_flag:
+            save_snippet_metadata(f"{noise_directory}/{tail}.json", framerate, noise_snippet_lengths)
+
+    return plots
+
+
 def _parse_args(args: List) -> argparse.Namespace:
     """Parses command line arguments.
 
@@ -294,6 +346,30 @@ def _parse_args(args: List) -> argparse.Namespace:
         dest="noise_flag"
     )
 
+    parser.add_argument(
+        "-a", "--a", "-aggregate", "--aggregate",
+        action="store_true",
+        help="Flag to save all snippets of a recording in a single .npz file instead of a file per snippet.",
+        dest="aggregate_flag"
+    )
+
+    parser.add_argument(
+        "-npy", "--npy",
+        action="store_true",
+        help="Flag to also save each snippet as a .npy file.",
+        dest="npy_flag"
+    )
+
+    parser.add_argument(
+        "-j", "--j", "-jobs", "--jobs",
+        nargs="?",
+        default=None,
+        type=int,
+        help="The number of processes to use. When plotting they are split evenly between snipping .wav files and "
+             "plotting, with at least one each. Defaults to the number of CPUs.",
+        dest="jobs"
+    )
+
     return parser.parse_args(args)
 
 
@@ -320,6 +396,173 @@ def parse_timestamps(filename: str) -> List[Tuple[str, float]]:
     return timestamps
 
 
+def time_to_index(time: np.ndarray, time_step: float, n_samples: int) -> np.ndarray:
+    """Finds the indices of the samples closest to times in evenly spaced samples starting at time 0.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        the times to find the closest samples to.
+    time_step : float
+        the time between consecutive samples.
+    n_samples : int
+        the number of samples.
+
+    Returns
+    -------
+    index : np.ndarray
+        the index of the closest sample to each time.
+    """
+    return np.clip(np.rint(np.asarray(time) / time_step), 0, n_samples - 1).astype(np.int64)
+
+
+# Figure, axes and line that a plotting process draws every plot on
+_plot_figure = None
+
+
+def _init_plot_process() -> None:
+    """Creates the figure that the current plotting process reuses for every plot."""
+    global _plot_figure
+    figure, axes = plt.subplots()
+    line, = axes.plot([], [])
+    # Axes and labels
+    axes.set_xlabel("Time (s)")
+    axes.set_ylabel("Normalised amplitude")
+    axes.set_ylim([-1.2, 1.2])
+    _plot_figure = (figure, axes, line)
+
+
+def plot_snippet(filename: str, time_slice: np.ndarray, signal_slice: np.ndarray, title: str) -> None:
+    """Plots a snippet and saves the plot. The figure of the current process is created on first use.
+
+    Parameters
+    ----------
+    filename : str
+        the path to save the plot to.
+    time_slice : np.ndarray
+        the time slice of the snippet.
+    signal_slice : np.ndarray
+        the normalised amplitude of the snippet.
+    title : str
+        the title of the plot.
+    """
+    if _plot_figure is None:
+        _init_plot_process()
+    figure, axes, line = _plot_figure
+    # Replace the plotted data and fit the time axis to it
+    line.set_data(time_slice, signal_slice)
+    axes.relim()
+    axes.autoscale_view()
+    # Title
+    axes.set_title(title)
+    # Save figure
+    figure.savefig(filename)
+
+
+def save_snippet(
+        root_name: str,
+        signal_slice: np.ndarray,
+        time_slice: np.ndarray,
+        buffer: Optional[np.ndarray] = None,
+        npy_flag: bool = False
+) -> np.ndarray:
+    """Saves a snippet in single precision as a raw .bin file with no header, and optionally as a .npy file too.
+
+    Parameters
+    ----------
+    root_name : str
+        the path of the snippet excluding the file extension.
+    signal_slice : np.ndarray
+        the normalised amplitude of the snippet.
+    time_slice : np.ndarray
+        the time slice of the snippet.
+    buffer : Optional[np.ndarray]
+        float32 array with 2 rows to assemble the snippet in. A larger array is allocated if `None` or too short.
+    npy_flag : bool
+        whether to also save the snippet as a .npy file.
+
+    Returns
+    -------
+    buffer : np.ndarray
+        the array the snippet was assembled in, which can be reused for the next snippet.
+    """
+    if buffer is None or buffer.shape[1] < len(signal_slice):
+        buffer = np.empty((2, len(signal_slice)), dtype=np.float32)
+    snippet = buffer[:, :len(signal_slice)]
+    snippet[0] = signal_slice
+    snippet[1] = time_slice
+    snippet.tofile(f"{root_name}.bin")
+    if npy_flag:
+        np.save(f"{root_name}.npy", snippet)
+    return buffer
+
+
+def save_snippet_metadata(filename: str, framerate: int, snippet_lengths: Dict[str, int]) -> None:
+    """Saves a JSON file describing the layout of the .bin snippet files of a recording.
+
+    Parameters
+    ----------
+    filename : str
+        the path of the JSON file.
+    framerate : int
+        the sample rate of the recording.
+    snippet_lengths : Dict[str, int]
+        the number of samples in each snippet, keyed by the snippet's file name excluding the file extension.
+    """
+    metadata = {
+        "dtype": "float32",
+        "rows": ["signal", "time"],
+        "framerate": int(framerate),
+        "snippets": snippet_lengths,
+    }
+    with open(filename, "w") as json_file:
+        json.dump(metadata, json_file, indent=4)
+
+
+def save_aggregated_snippets(filename: str, snippets: List[Tuple[str, np.ndarray, np.ndarray]]) -> None:
+    """Saves the snippets of a recording together in a single .npz file.
+
+    The signal and time slices of every snippet are concatenated into the columns of a single float32 array with 2 rows,
+    with snippet i in the columns offsets[i] to offsets[i + 1]. Use `load_aggregated_snippets` to split them up again.
+
+    Parameters
+    ----------
+    filename : str
+        the path of the .npz file.
+    snippets : List[Tuple[str, np.ndarray, np.ndarray]]
+        the name, normalised amplitude and time slice of each snippet.
+    """
+    offsets = np.zeros(len(snippets) + 1, dtype=np.int64)
+    np.cumsum([len(signal_slice) for _, signal_slice, _ in snippets], out=offsets[1:])
+    aggregated = np.empty((2, offsets[-1]), dtype=np.float32)
+    for (_, signal_slice, time_slice), start, end in zip(snippets, offsets[:-1], offsets[1:]):
+        aggregated[0, start:end] = signal_slice
+        aggregated[1, start:end] = time_slice
+    names = np.array([name for name, _, _ in snippets], dtype=str)
+    np.savez(filename, snippets=aggregated, offsets=offsets, names=names)
+
+
+def load_aggregated_snippets(filename: str) -> List[Tuple[str, np.ndarray]]:
+    """Loads the snippets saved together in a .npz file by `save_aggregated_snippets`.
+
+    Parameters
+    ----------
+    filename : str
+        the path of the .npz file.
+
+    Returns
+    -------
+    snippets : List[Tuple[str, np.ndarray]]
+        the name of each snippet, in the same format as snippet file names, and its array in the same layout as a
+        snippet file. The name works with `get_snippet_event` and the array with `parse_snippet`.
+    """
+    with np.load(filename) as aggregated_file:
+        aggregated = aggregated_file["snippets"]
+        offsets = aggregated_file["offsets"]
+        names = aggregated_file["names"]
+    return [(name, aggregated[:, start:end]) for name, start, end in zip(names.tolist(), offsets[:-1], offsets[1:])]
+
+
 def normalise_signal(signal: np.ndarray) -> np.ndarray:
     """Normalises a signal.
 
@@ -333,10 +576,51 @@ def normalise_signal(signal: np.ndarray) -> np.ndarray:
     normalised_signal : np.ndarray
         the normalised signal.
     """
-    signal_centre = np.mean(signal)
-    standardised_signal = signal - signal_centre
-    signal_amplitude = np.max(np.abs(standardised_signal))
-    return standardised_signal / signal_amplitude
+    # The reductions are done on the raw samples, which are int16 for recordings and so half the size of the output
+    signal_centre = np.mean(signal, dtype=np.float64)
+    signal_amplitude = max(np.max(signal) - signal_centre, signal_centre - np.min(signal))
+    # Centre into a single new float32 array and scale it in place rather than allocating a temporary for each step
+    standardised_signal = np.subtract(signal, signal_centre, dtype=np.float32)
+    standardised_signal /= signal_amplitude
+    return standardised_signal
+
+
+def find_snippet_files(snippet_folder: str) -> List[str]:
+    """Finds the snippet files in a folder, taking a snippet's raw .bin file over its .npy file if it has both.
+
+    Parameters
+    ----------
+    snippet_folder : str
+        the folder of snippets to search.
+
+    Returns
+    -------
+    snippet_files : List[str]
+        the sorted paths of the snippet files.
+    """
+    bin_files = glob.glob(f"{snippet_folder}/*.bin")
+    bin_roots = {os.path.splitext(bin_file)[0] for bin_file in bin_files}
+    npy_files = [npy_file for npy_file in glob.glob(f"{snippet_folder}/*.npy") if npy_file[:-4] not in bin_roots]
+    return sorted(bin_files + npy_files)
+
+
+def load_snippet(snippet_file: str) -> np.ndarray:
+    """Loads a snippet file saved by `save_snippet`, either a raw float32 .bin file or a .npy file.
+
+    Parameters
+    ----------
+    snippet_file : str
+        the path to the snippet file.
+
+    Returns
+    -------
+    snippet : np.ndarray
+        the snippet with the signal in the first row and the time in the second row.
+    """
+    if snippet_file.endswith(".bin"):
+        # Signal and time are stacked so the raw data has two rows
+        return np.fromfile(snippet_file, dtype=np.float32).reshape(2, -1)
+    return np.load(snippet_file)
 
 
 def parse_snippet(snippet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
@@ -345,7 +629,7 @@ def parse_snippet(snippet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     Parameters
     ----------
     snippet : np.ndarray
-        the array loaded from a snippet file.
+        the array loaded from a snippet file or by `load_aggregated_snippets`.
 
     Returns
     -------